@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+
+
+class Buckets:
+    """ the unsolved cells of a Sudoku puzzle, grouped by the length of
+    their candidate strings: cells[k] is a bitmask with bit i set if cell i
+    is unsolved with k candidates. Kept up to date by Sudoku.insert() as
+    candidates are eliminated, so that Sudoku.expand() can pick the most
+    constrained cell and detect a complete puzzle without scanning the whole
+    grid.
+
+    size is the length of a full candidate string, len(Sudoku.candidates),
+    which is more than the puzzle size once values have two digits. """
+
+    __slots__ = ('cells', 'unsolved')
+
+    def __init__(self, puzzle=None, size=9):
+        self.cells = [0] * (size + 1)
+        # number of unsolved cells; 0 once the puzzle is complete
+        self.unsolved = 0
+
+        if puzzle is not None:
+            for i in range(len(puzzle)):
+                if not isinstance(puzzle[i], int):
+                    self.cells[len(puzzle[i])] |= 1 << i
+                    self.unsolved += 1
+
+
+    def copy(self):
+        """ returns an independent copy, for a new branch of the search """
+        result = Buckets.__new__(Buckets)
+        result.cells = self.cells[:]
+        result.unsolved = self.unsolved
+        return result
+
+
+    def counts(self):
+        """ returns the number of unsolved cells with k candidates, for each
+        k, as a list indexed like cells """
+        return [cells.bit_count() for cells in self.cells]
+
+
+    def eliminate(self, index, before, after):
+        """ records that the candidate string of unsolved cell index went
+        from length before to length after. Eliminating a value of two or
+        more digits shortens it by more than one. """
+        bit = 1 << index
+        self.cells[before] &= ~bit
+        self.cells[after] |= bit
+
+
+    def fewest(self):
+        """ returns the lowest index of an unsolved cell with the shortest
+        candidate string, or -1 if there are none """
+        for cells in self.cells:
+            if cells:
+                # index of the lowest set bit
+                return (cells & -cells).bit_length() - 1
+        return -1
+
+
+    def solve(self, index, count):
+        """ records that unsolved cell index, which had count candidates, has
+        been solved """
+        self.cells[count] &= ~(1 << index)
+        self.unsolved -= 1
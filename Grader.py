@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+
+import math
+import numpy as np
+
+
+class Grader:
+    """ batch verifier for completed Sudoku grids submitted by users. Grids
+    are rows of an (N, size**2) array of ints in the same row-major layout as
+    Sudoku.puzzle; row, column and box checks run on the whole batch at once
+    with NumPy rather than cell by cell with Sudoku.used_in_row() etc. """
+
+    def __init__(self, size=9, chunk=10000):
+        self.size = size
+        self.box_size = int(math.sqrt(size))
+        # grids verified per pass, to bound the size of temporary arrays
+        self.chunk = chunk
+
+        # row, column and box of each cell
+        cells = np.arange(size**2)
+        self.rows = cells // size
+        self.cols = cells % size
+        self.boxes = ((self.rows // self.box_size) * self.box_size
+                      + self.cols // self.box_size)
+
+
+    def conflicts(self, grids):
+        """ helper function for verify(). returns an (N, size**2) boolean array
+        marking cells of given grids whose value is out of range or repeated
+        in the cell's row, column or box. """
+        n = self.size
+        b = self.box_size
+        count = len(grids)
+
+        bad = (grids < 1) | (grids > n)
+        digits = np.where(bad, 1, grids) - 1
+        # one-hot encoding: onehot[g, i, d] is 1 if cell i holds d + 1
+        onehot = (digits[..., None] == np.arange(n)) & ~bad[..., None]
+        onehot = onehot.astype(np.int8).reshape(count, n, n, n)
+
+        # occurrences of each digit in each row, column and box, flattened so
+        # that unit u and digit d are at index u * size + d
+        in_rows = onehot.sum(axis=2, dtype=np.int16).reshape(count, -1)
+        in_cols = onehot.sum(axis=1, dtype=np.int16).reshape(count, -1)
+        in_boxes = onehot.reshape(count, b, b, b, b, n).sum(
+            axis=(2, 4), dtype=np.int16).reshape(count, -1)
+
+        # occurrences of each cell's own value in its row, column and box
+        repeats = np.take_along_axis(in_rows, self.rows * n + digits, axis=1)
+        repeats = np.maximum(repeats, np.take_along_axis(
+            in_cols, self.cols * n + digits, axis=1))
+        repeats = np.maximum(repeats, np.take_along_axis(
+            in_boxes, self.boxes * n + digits, axis=1))
+        return bad | (repeats > 1)
+
+
+    def verify(self, submissions, solutions=None):
+        """ verifies given submissions, an (N, size**2) array-like of
+        completed grids. If solutions are given, either one grid for all
+        submissions or one per submission, cells that differ from the
+        solution are marked as conflicts too.
+
+        Returns a pair (valid, conflicts): valid is a length-N boolean array,
+        True for each submission that is a complete, valid grid (matching
+        its solution, if given); conflicts is an (N, size**2) boolean array
+        marking the offending cells of each submission. """
+        grids = np.asarray(submissions).reshape(-1, self.size**2)
+        if solutions is not None:
+            solutions = np.broadcast_to(
+                np.asarray(solutions).reshape(-1, self.size**2), grids.shape)
+
+        conflicts = np.empty(grids.shape, dtype=bool)
+        for start in range(0, len(grids), self.chunk):
+            stop = start + self.chunk
+            conflicts[start:stop] = self.conflicts(grids[start:stop])
+            if solutions is not None:
+                conflicts[start:stop] |= (grids[start:stop]
+                                          != solutions[start:stop])
+
+        valid = ~conflicts.any(axis=1)
+        return valid, conflicts
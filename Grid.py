@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+
+
+class Grid:
+    """ compact snapshot of the values in a Sudoku puzzle: one byte per cell,
+    holding the cell's value if solved and 0 otherwise, in the same row-major
+    layout as Sudoku.puzzle. Candidate strings are not stored; they can be
+    recomputed from the values with Sudoku.restore(). """
+
+    __slots__ = ('size', 'cells')
+
+    def __init__(self, size=9, values=None):
+        self.size = size
+        if values is None:
+            self.cells = bytearray(size**2)
+        else:
+            self.cells = bytearray(values)
+
+
+    def __eq__(self, other):
+        return isinstance(other, Grid) and self.cells == other.cells
+
+
+    def __getitem__(self, key):
+        return self.cells[key]
+
+
+    def __iter__(self):
+        return iter(self.cells)
+
+
+    def __len__(self):
+        return len(self.cells)
+
+
+    def __setitem__(self, key, value):
+        self.cells[key] = value
+
+
+    def to_list(self):
+        """ returns the grid values as a list of ints, 0 for empty cells """
+        return list(self.cells)
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+
+import random
+import math
+
+
+class GridFactory:
+    """ iterator over complete, valid Sudoku solution grids of a given size.
+    Grids are plain lists of ints in the same row-major layout as
+    Sudoku.puzzle, ready to be passed as the puzzle argument of Sudoku().
+
+    Each grid is produced by applying a random validity-preserving transform
+    to a seed grid. Seeds are replaced every reseed grids, so that successive
+    grids are not all isomorphic. Up to 16x16, seeds come from a randomized
+    fill. Larger fills rarely finish within their budget, so seeds are the
+    pattern() grid scrambled by mix() instead. mix() is a random walk over
+    valid grids, not a uniform draw from them; see mix(). """
+
+    def __init__(self, size=9, reseed=100):
+        self.size = size
+        self.box_size = int(math.sqrt(size))
+        self.reseed = reseed
+        self.seed = None
+        self.count = 0
+
+
+    def __iter__(self):
+        return self
+
+
+    def __next__(self):
+        if self.seed is None or self.count % self.reseed == 0:
+            self.seed = self.fill()
+        self.count += 1
+
+        return self.shuffle(self.seed)
+
+
+    def apply(self, grid, transform):
+        """ returns a new grid with given transform applied to given grid.
+        Empty cells (0) stay empty, so a transform can be applied to a puzzle
+        and to its solution alike. """
+        cells, relabel = transform
+        return [relabel[grid[i]] for i in cells]
+
+
+    def fill(self):
+        """ returns a complete grid filled by randomized backtracking. Each
+        step fills the empty cell with the fewest remaining values, and the
+        fill starts over from scratch if it backtracks more than a few times
+        per cell. Above 16x16, where a fill succeeds only about one time in
+        five and takes around half a second per attempt, and after a few
+        failed attempts at 16x16, it returns the pattern() grid scrambled by
+        mix() instead. """
+        if self.size <= 16:
+            for attempt in range(3):
+                grid = self.try_fill(4 * self.size**2)
+                if grid is not None:
+                    return grid
+        return self.mix(self.pattern(), 10 * self.size**2)
+
+
+    def mix(self, grid, moves):
+        """ returns a copy of given grid after given number of random cycle
+        swaps. A swap takes two rows of a band (or two columns of a stack)
+        and exchanges their values in a set of columns (or rows) that is
+        closed under the values it moves, so that every line keeps its
+        values; cells only move within their box. Unlike random_transform(),
+        swaps change the grid's isomorphism class, so mixing the pattern()
+        grid gives seeds that are not all isomorphic to it. """
+        n = self.size
+        b = self.box_size
+        grid = grid[:]
+
+        for move in range(moves):
+            band = random.randrange(b)
+            first, second = random.sample(range(band * b, band * b + b), 2)
+            if random.random() < 0.5:
+                # two rows; cell k of line i is grid[i * n + k]
+                def cell(line, k):
+                    return line * n + k
+            else:
+                # two columns; cell k of line i is grid[k * n + i]
+                def cell(line, k):
+                    return k * n + line
+
+            # index of each value along the first line
+            where = {grid[cell(first, k)]: k for k in range(n)}
+
+            # follow the cycle of positions from a random start, until the
+            # value brought into the first line is the one it gave away
+            start = random.randrange(n)
+            cycle = [start]
+            value = grid[cell(second, start)]
+            while value != grid[cell(first, start)]:
+                k = where[value]
+                cycle.append(k)
+                value = grid[cell(second, k)]
+
+            for k in cycle:
+                i, j = cell(first, k), cell(second, k)
+                grid[i], grid[j] = grid[j], grid[i]
+
+        return grid
+
+
+    def pattern(self):
+        """ returns the canonical complete grid, in which each row is the row
+        above shifted by one box width (or by one cell across bands) """
+        n = self.size
+        b = self.box_size
+        return [(b * (r % b) + r // b + c) % n + 1
+                for r in range(n) for c in range(n)]
+
+
+    def try_fill(self, budget):
+        """ helper function for fill(). returns a complete grid filled by
+        randomized backtracking, or None if more than budget values had to be
+        tried. """
+        n = self.size
+        b = self.box_size
+        full = (1 << n) - 1
+        rows = [0] * n
+        cols = [0] * n
+        boxes = [0] * n
+        grid = [0] * n**2
+        box_of = [(i // n) // b * b + (i % n) // b for i in range(n**2)]
+
+        # shuffle so that ties between equally constrained cells are random
+        empty = list(range(n**2))
+        random.shuffle(empty)
+        tries = [0]
+
+        def backtrack():
+            if not empty:
+                return True
+
+            # pick the most constrained empty cell
+            best = -1
+            best_count = n + 1
+            for i in empty:
+                used = rows[i // n] | cols[i % n] | boxes[box_of[i]]
+                count = n - bin(used).count('1')
+                if count < best_count:
+                    best = i
+                    best_count = count
+                    if count <= 1:
+                        break
+            if best_count == 0:
+                return False
+
+            r, c, x = best // n, best % n, box_of[best]
+            options = full & ~(rows[r] | cols[c] | boxes[x])
+            values = [v for v in range(n) if options >> v & 1]
+            random.shuffle(values)
+
+            empty.remove(best)
+            for v in values:
+                tries[0] += 1
+                if tries[0] > budget:
+                    break
+                bit = 1 << v
+                rows[r] |= bit
+                cols[c] |= bit
+                boxes[x] |= bit
+                grid[best] = v + 1
+                if backtrack():
+                    return True
+                rows[r] &= ~bit
+                cols[c] &= ~bit
+                boxes[x] &= ~bit
+            grid[best] = 0
+            empty.append(best)
+            return False
+
+        if backtrack():
+            return grid
+        return None
+
+
+    def random_transform(self):
+        """ returns a random validity-preserving transform as a pair (cells,
+        relabel): cells[i] is the index of the source cell for cell i, and
+        relabel[v] is the new digit for digit v (relabel[0] is 0).
+
+        The transform combines row permutations within bands, column
+        permutations within stacks, band and stack swaps, an optional
+        transposition and a digit relabeling. Rotations and reflections are
+        compositions of these. """
+        n = self.size
+        b = self.box_size
+
+        def lines():
+            # permute bands (or stacks), then lines within each of them
+            order = []
+            for band in random.sample(range(b), b):
+                order += random.sample(range(band * b, band * b + b), b)
+            return order
+
+        rows = lines()
+        cols = lines()
+        if random.random() < 0.5:
+            cells = [rows[r] * n + cols[c] for r in range(n) for c in range(n)]
+        else:
+            cells = [cols[c] * n + rows[r] for r in range(n) for c in range(n)]
+
+        relabel = [0] + random.sample(range(1, n + 1), n)
+
+        return cells, relabel
+
+
+    def shuffle(self, grid):
+        """ returns a copy of given grid with a random validity-preserving
+        transform applied; see random_transform() """
+        return self.apply(grid, self.random_transform())
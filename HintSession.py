@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+
+
+class HintSession:
+    """ stateful interactive play session on a Sudoku. The board is a
+    working copy of the Sudoku's puzzle whose candidate strings are kept in
+    step with every placement and erase through Sudoku.insert() and
+    Sudoku.remove(), so that hint() never has to rebuild or solve a Sudoku.
+    Every change can be undone and redone. """
+
+    def __init__(self, sudoku):
+        self.sudoku = sudoku
+        self.board = sudoku.puzzle[:]
+        # cells given in the puzzle, which cannot be changed by the player
+        self.givens = {i for i in range(len(self.board))
+                       if isinstance(self.board[i], int)}
+        # each change is stored as (index, value before, value after), with
+        # None for an empty cell
+        self.undo_stack = []
+        self.redo_stack = []
+
+        # cell indices of every row, column and box
+        size = sudoku.size
+        box_size = sudoku.box_size
+        self.units = []
+        for i in range(size):
+            self.units.append(list(range(i * size, (i + 1) * size)))
+        for i in range(size):
+            self.units.append(list(range(i, size**2, size)))
+        for i in range(size):
+            top_left = ((i // box_size) * box_size * size
+                        + (i % box_size) * box_size)
+            self.units.append([top_left + r * size + c
+                               for r in range(box_size)
+                               for c in range(box_size)])
+
+
+    def __getitem__(self, key):
+        return self.board[key]
+
+
+    def candidates(self, index):
+        """ returns the candidate values of given cell as a string, or the
+        empty string if the cell holds a value """
+        if isinstance(self.board[index], int):
+            return ''
+        return self.board[index]
+
+
+    def erase(self, index):
+        """ erases the value the player placed in given cell """
+        if index in self.givens:
+            raise ValueError(f"cell {index} is given and cannot be erased")
+        if not isinstance(self.board[index], int):
+            # cell is empty; nothing to erase
+            return
+
+        self.undo_stack.append((index, self.board[index], None))
+        self.redo_stack = []
+        self.set(index, None)
+
+
+    def hint(self):
+        """ returns the next logical move as a tuple (technique, index,
+        value), or None if no single can be found. technique is one of:
+            'contradiction' - cell index has no candidates left (value is
+                              None); an earlier placement was wrong
+            'naked single'  - value is the only candidate of cell index
+            'hidden single' - cell index is the only place for value in one
+                              of its row, column or box
+        """
+        board = self.board
+
+        for i in range(len(board)):
+            if isinstance(board[i], int):
+                continue
+            if len(board[i]) == 0:
+                return ('contradiction', i, None)
+            if len(board[i]) == 1:
+                return ('naked single', i, int(board[i]))
+
+        for unit in self.units:
+            # all candidates of the unit's empty cells, counted in one string
+            cells = [i for i in unit if not isinstance(board[i], int)]
+            joined = ''.join([board[i] for i in cells])
+            for candidate in self.sudoku.candidates:
+                if joined.count(candidate) == 1:
+                    for i in cells:
+                        if candidate in board[i]:
+                            return ('hidden single', i, int(candidate))
+
+        return None
+
+
+    def place(self, index, value):
+        """ places given value in given cell, replacing any value the player
+        placed there before """
+        if index in self.givens:
+            raise ValueError(f"cell {index} is given and cannot be changed")
+        if not 1 <= value <= self.sudoku.size:
+            raise ValueError(f"value {value} is out of range")
+
+        before = self.board[index]
+        if not isinstance(before, int):
+            before = None
+        if before == value:
+            return
+
+        self.undo_stack.append((index, before, value))
+        self.redo_stack = []
+        self.set(index, value)
+
+
+    def redo(self):
+        """ redoes the last undone change; returns False if there is none """
+        if not self.redo_stack:
+            return False
+
+        index, before, after = self.redo_stack.pop()
+        self.set(index, after)
+        self.undo_stack.append((index, before, after))
+        return True
+
+
+    def set(self, index, value):
+        """ helper function for erase(), place(), undo() and redo(). sets
+        given cell to given value (None to empty it), updating the candidates
+        of its neighbors incrementally. """
+        if isinstance(self.board[index], int):
+            self.sudoku.remove(index, self.board)
+        if value is not None:
+            self.sudoku.insert(str(value), index, self.board)
+
+
+    def undo(self):
+        """ undoes the last change; returns False if there is none """
+        if not self.undo_stack:
+            return False
+
+        index, before, after = self.undo_stack.pop()
+        self.set(index, before)
+        self.redo_stack.append((index, before, after))
+        return True
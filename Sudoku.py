@@ -4,6 +4,8 @@ import random
 import math
 import time
 import numpy as np
+from Grid import Grid
+from Buckets import Buckets
 
 
 """ todos:
@@ -14,10 +16,34 @@ import numpy as np
 
 """
 
+class BudgetExceeded(Exception):
+    """ raised by search(), and thus solve_all() and iter_solutions(), when
+    a solve runs out of nodes or time, or is cancelled """
+
 class Sudoku:
     """ represents a Sudoku puzzle """
 
-    def __init__(self, size=9, label=time.time(), puzzle=[]):
+    """ fixed attribute layout: no per-instance __dict__, which matters when
+    large populations of Sudokus are held in memory """
+    __slots__ = ('puzzle', 'size', 'box_size', 'label', 'candidates',
+                 'solutions', 'difficulty', 'branch_factors', 'status',
+                 'nodes', 'max_nodes', 'deadline', 'cancel')
+
+    # coefficients of features(), fitted on 9x9 puzzles by
+    # benchmarks/calibrate_estimate.py: a linear fit of the B term of score()
+    # for uniquely solvable puzzles, and a logistic fit of the log odds that
+    # a puzzle is uniquely solvable; see estimate()
+    estimate_fit = (-0.6337, 0.0646, -0.0351, -0.0731, 0.0024, 0.0355)
+    validity_fit = (-0.5473, -0.0727, 0.0486, 0.1021, 0.0381, -0.0916)
+    # estimate() gives NaN below this probability of a unique solution
+    validity_cutoff = 0.02
+
+    # cell indices of the columns, rows and boxes of each puzzle size; see
+    # units()
+    unit_cache = {}
+
+    def __init__(self, size=9, label=time.time(), puzzle=[],
+                 max_nodes=None, timeout=None, cancel=None, solve=True):
         # instance attributes:
         self.puzzle = []
         self.size = size
@@ -53,6 +79,17 @@ class Sudoku:
         self.difficulty = np.NaN
         self.branch_factors = []
 
+        """ outcome of the last solve(): 'unsolvable', 'unique', 'multiple',
+        or 'budget exceeded' if the search was cut short before a verdict
+        (see check_budget()) """
+        self.status = None
+
+        """ search budget of the current solve; see check_budget() """
+        self.nodes = 0
+        self.max_nodes = None
+        self.deadline = None
+        self.cancel = None
+
         # initialize self.candidates based on puzzle size
         for i in range(self.size):
             self.candidates += str(i + 1)
@@ -70,8 +107,12 @@ class Sudoku:
                     self.insert(str(puzzle[i]), i)
 
         """ store solution and score puzzle; solve() will provide values for
-        self.solutions and self.difficulty """
-        self.solve(report=False)
+        self.solutions and self.difficulty. Untrusted puzzles should be
+        given a budget; see solve(). Callers that already know the solution
+        (e.g. SudokuGenerator.variants()) can skip this with solve=False """
+        if solve:
+            self.solve(report=False, max_nodes=max_nodes, timeout=timeout,
+                       cancel=cancel)
 
 
     def __getitem__(self, key):
@@ -88,71 +129,154 @@ class Sudoku:
         return self.print()
 
 
-    def fewest_candidates(self, puzzle=None):
-        """ helper function for solve_all(). returns the index of cell in
-        puzzle with fewest remaining candidate values.
-        """
+    def check_budget(self):
+        """ helper function for search(), called once per search node when a
+        budget is set. Raises BudgetExceeded if the search has visited
+        self.max_nodes nodes, has run past self.deadline (a time.monotonic()
+        value), or if self.cancel (e.g. a threading.Event) has been set. """
+        self.nodes += 1
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            raise BudgetExceeded(f"node budget of {self.max_nodes} exceeded")
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise BudgetExceeded("time budget exceeded")
+        if self.cancel is not None and self.cancel.is_set():
+            raise BudgetExceeded("solve cancelled")
+
+
+    def clear_budget(self):
+        """ helper function for solve_steps() and iter_solutions(). lifts
+        the budget of a search once it ends, however it ends, so that a later
+        search on this Sudoku (e.g. a direct solve_all()) is not charged
+        against it. self.nodes keeps the count of the search that ended. """
+        self.max_nodes = None
+        self.deadline = None
+        self.cancel = None
+
+
+    def encode(self, puzzle=None):
+        """ returns a compact, hashable encoding of given puzzle: one byte per
+        cell, holding the cell's value if solved and 0 otherwise. Helper
+        function for iter_solutions(). """
         if puzzle is None:
             puzzle = self.puzzle
-            
-        fewest = -1
-        for i in range(self.size**2):
-            if isinstance(puzzle[i], int):
-                # cell is solved; skip it
+
+        return bytes(cell if isinstance(cell, int) else 0 for cell in puzzle)
+
+
+    def estimate(self, puzzle=None):
+        """ returns a cheap estimate of the difficulty score() would give the
+        given puzzle, without searching, from its features().
+
+        If naked singles solve the puzzle, it has a unique solution, B is 0
+        and the estimate is exact. Otherwise, if the validity_fit model gives
+        the puzzle less than validity_cutoff chance of a unique solution, or
+        naked singles reach a contradiction, the estimate is NaN, as score()
+        would most likely be. Otherwise B is estimated by estimate_fit, at
+        least 1, so an estimate below 100 is always exact. The B estimate is
+        rough (see benchmarks/calibrate_estimate.py); the validity estimate
+        is what rules puzzles out. """
+        features = self.features(puzzle)
+        if features is None:
+            return np.NaN
+
+        empty_cells = features[1]
+        if features[2] == 0:
+            return empty_cells
+
+        log_odds = sum(w * x for w, x in zip(self.validity_fit, features))
+        if 1 / (1 + math.exp(-log_odds)) < self.validity_cutoff:
+            return np.NaN
+
+        B = max(1, sum(w * x for w, x in zip(self.estimate_fit, features)))
+        return B * 100 + empty_cells
+
+
+    def expand(self, puzzle, buckets=None):
+        """ helper function for search(). fills every cell of given puzzle
+        that can be filled without branching, then returns the search set of
+        (value, position) pairs to branch on: [] if the puzzle is complete,
+        or None if it is unsolvable.
+
+        The puzzle's Buckets (built here if not given) stand in for
+        is_complete() and a scan for the cell with the fewest candidates, so
+        that each cell filled costs a pass over its neighbors rather than
+        over the whole grid. """
+        if buckets is None:
+            buckets = Buckets(puzzle, len(self.candidates))
+
+        while buckets.unsolved > 0:
+            i = buckets.fewest()
+
+            if len(puzzle[i]) == 1:
+                # all candidates but one have been eliminated; officially
+                # solve cell with insert()
+                self.insert(puzzle[i], i, puzzle, buckets)
                 continue
-            if len(puzzle[i]) <= 1:
-                """ cell has only one candidate, or is unsolvable; this cell
-                should be processed immediately by caller function.
-                """
-                return i
-            if fewest == -1:
-                # first candidate has been found;
-                fewest = i
-            elif len(puzzle[i]) < len(puzzle[fewest]):
-                # cell has fewest candidates of cells checked so far
-                fewest = i
-        return fewest
+            if len(puzzle[i]) == 0:
+                # cell has no possible solutions; puzzle unsolvable
+                return None
+
+            # cell has more than one candidate
+            search_set = []
+            """ find value with fewest possible remaining positions in
+            some set (row, column, or box) """
+            fpp_value, fpp_positions = self.fewest_positions(puzzle)
+
+            if len(fpp_positions) < len(puzzle[i]):
+                # value-set is more promising than current cell
+                for position in fpp_positions:
+                    # build search_set to try value in each position in set
+                    search_set.append((fpp_value, position))
+            else:
+                # current cell is more promising than value-set
+                candidates = random.sample(puzzle[i], len(puzzle[i]))
+                for candidate in candidates:
+                    # build search-set to try each candidate in cell
+                    search_set.append((candidate, i))
+            return search_set
+
+        return []
+
+
+    def features(self, puzzle=None):
+        """ helper function for estimate(). places naked singles on a copy of
+        given puzzle with propagate(), and returns the puzzle's features as a
+        list: 1 (for an intercept), the number of empty cells (the clue count
+        the other way round), the number of cells naked singles leave
+        unsolved, and how many of those have 2, 3, and more candidates.
+        Returns None if naked singles reach a contradiction. """
+        if puzzle is None:
+            puzzle = self.puzzle
+        puzzle = puzzle[:]
+
+        buckets = Buckets(puzzle, len(self.candidates))
+        empty_cells = buckets.unsolved
+        if self.propagate(puzzle, buckets) is None:
+            return None
+
+        counts = buckets.counts()
+        return [1, empty_cells, buckets.unsolved, counts[2], counts[3],
+                sum(counts[4:])]
 
 
     def fewest_positions(self, puzzle=None):
-        """ helper function for solve_all(). returns the candidate value with
+        """ helper function for expand(). returns the candidate value with
         the fewest possible positions in a given set (row, column, or box) and
-        the indices of that set. """
+        the indices of that set. Sets are scanned in the order of units(), and
+        ties go to the first value found; a value with a single position
+        cannot be beaten, so the scan stops there. """
         if puzzle is None:
             puzzle = self.puzzle
 
         fpp_candidate = ''
         fpp_positions = list(range(self.size**2))
-        
-        # find value with fewest candidate positions by column
-        d = {}
-        for col in range(0, self.size):
-            for i in range(0, self.size**2, self.size):
-                j = i + col
-                if isinstance(puzzle[j], int):
-                    continue
-    
-                for candidate in puzzle[j]:
-                    if candidate in d:
-                        d[candidate].append(j)
-                    else:
-                        d[candidate] = [j]
 
-            for candidate in d:
-                if len(d[candidate]) < len(fpp_positions):
-                    fpp_candidate = candidate
-                    fpp_positions = d[candidate]
-                
+        for unit in self.units():
             d = {}
-            
-        # now by row
-        d = {}
-        for row in range(0, self.size**2, self.size):
-            for i in range(0, self.size):
-                j = i + row
+            for j in unit:
                 if isinstance(puzzle[j], int):
                     continue
-                
+
                 for candidate in puzzle[j]:
                     if candidate in d:
                         d[candidate].append(j)
@@ -163,52 +287,22 @@ class Sudoku:
                 if len(d[candidate]) < len(fpp_positions):
                     fpp_candidate = candidate
                     fpp_positions = d[candidate]
-   
-            d = {}
-            
-        # now by box
-        d = {}
-        i = 0
-        while i < self.size**2:
-            # traverse across boxes, where i is the index of the top-left cell
-            for j in range(0, self.size * self.box_size, self.size):
-                for k in range (0, self.box_size):
-                    # traverse within each box
-                    index = i + j + k
-                    if isinstance(puzzle[index], int):
-                        continue
-                    
-                    for candidate in puzzle[index]:
-                        if candidate in d:
-                            d[candidate].append(index)
-                        else:
-                            d[candidate] = [index]
-                            
-            # entire box checked; process and clear dictionary
-            for candidate in d:
-                if len(d[candidate]) < len(fpp_positions):
-                    fpp_candidate = candidate
-                    fpp_positions = d[candidate]
-
-            d = {}
+                    if len(fpp_positions) == 1:
+                        # hidden single
+                        return fpp_candidate, fpp_positions
 
-            # increment counter for next box
-            i += self.box_size
-            if i % self.size == 0:
-                """ we have finished the boxes in this row of the puzzle (e.g.,
-                boxes 1, 2, and 3 in a 9x9 Sudoku); so increment i further to
-                set it to the top-left cell of the next box (e.g., box 4) """
-                i += self.size * (self.box_size - 1)
-        
         return fpp_candidate, fpp_positions
 
 
-    def insert(self, value, index, puzzle=None):
+    def insert(self, value, index, puzzle=None, buckets=None):
         """ inserts given value into given cell of Sudoku puzzle, and removes
         that value from the candidates list of all neighboring cells. Helper
-        function for __init__() and solve_all(). """
+        function for __init__() and search(). If the puzzle's Buckets are
+        given, they are updated for every candidate eliminated. """
         if puzzle is None:
             puzzle = self.puzzle
+        if buckets is not None and not isinstance(puzzle[index], int):
+            buckets.solve(index, len(puzzle[index]))
             
         row = index // self.size
         col = index % self.size            
@@ -224,7 +318,12 @@ class Sudoku:
                 if isinstance(puzzle[j], int):
                     continue
                 if value in puzzle[j]:
+                    count = len(puzzle[j])
                     puzzle[j] = puzzle[j].replace(value, '')
+                    if buckets is not None and j != index:
+                        # value may be two characters long in a 16x16
+                        # puzzle, so measure the string before and after
+                        buckets.eliminate(j, count, len(puzzle[j]))
 
         # step two: remove from candidates elsewhere in column
         for i in range(0, self.size**2, self.size):
@@ -232,7 +331,10 @@ class Sudoku:
             if isinstance(puzzle[j], int):
                 continue
             if value in puzzle[j]:
+                count = len(puzzle[j])
                 puzzle[j] = puzzle[j].replace(value, '')
+                if buckets is not None and j != index:
+                    buckets.eliminate(j, count, len(puzzle[j]))
 
         # step three: remove from candidates elsewhere in row
         row_index = row * self.size
@@ -241,7 +343,10 @@ class Sudoku:
             if isinstance(puzzle[j], int):
                 continue
             if value in puzzle[j]:
+                count = len(puzzle[j])
                 puzzle[j] = puzzle[j].replace(value, '')
+                if buckets is not None and j != index:
+                    buckets.eliminate(j, count, len(puzzle[j]))
 
         # step four: insert value
         puzzle[index] = int(value)
@@ -262,6 +367,42 @@ class Sudoku:
         return True
 
 
+    def iter_solutions(self, limit=None, puzzle=None, max_nodes=None,
+                       timeout=None, cancel=None):
+        """ generator that yields each complete, valid solution to the given
+        puzzle as soon as it is found, stopping after limit solutions (or
+        when the search tree is exhausted, if limit is None).
+
+        Unlike solve_all(), it does not stop at the second solution, and
+        neither self.solutions nor self.branch_factors is touched. Found
+        solutions are de-duplicated by the hash of their encode() value, so
+        only a single integer is kept per solution yielded.
+
+        max_nodes, timeout and cancel bound the search as in solve(); when
+        the budget runs out, BudgetExceeded is raised to the consumer.
+        """
+        if puzzle is None:
+            puzzle = self.puzzle
+        if limit is not None and limit <= 0:
+            return
+        self.set_budget(max_nodes, timeout, cancel)
+
+        seen = set()
+        try:
+            for solution in self.search(puzzle[:]):
+                key = hash(self.encode(solution))
+                if key in seen:
+                    continue
+                seen.add(key)
+                yield solution
+
+                if limit is not None and len(seen) >= limit:
+                    return
+        finally:
+            # also runs if the consumer abandons the generator
+            self.clear_budget()
+
+
     def print(self, puzzle=None):
         if puzzle is None:
             puzzle = self.puzzle
@@ -294,16 +435,42 @@ class Sudoku:
         return res
 
 
+    def propagate(self, puzzle=None, buckets=None):
+        """ places every naked single on given puzzle, in place, until none
+        are left. Returns the puzzle's Buckets (built here if not given), or
+        None if a cell runs out of candidates, i.e., the puzzle has no
+        solution. """
+        if puzzle is None:
+            puzzle = self.puzzle
+        if buckets is None:
+            buckets = Buckets(puzzle, len(self.candidates))
+
+        while buckets.unsolved > 0:
+            i = buckets.fewest()
+            if len(puzzle[i]) == 0:
+                # cell has no possible solutions; puzzle unsolvable
+                return None
+            if len(puzzle[i]) > 1:
+                # naked singles are exhausted
+                break
+            self.insert(puzzle[i], i, puzzle, buckets)
+
+        return buckets
+
+
     def remove(self, index, puzzle=None):
         """ removes value from given cell (index) of Sudoku puzzle, and stores
         all candidate values in that cell that are not already used in this
-        cell's row, column, or box. """
+        cell's row, column, or box. The removed value is also restored to the
+        candidates of neighboring cells where it is no longer used, undoing
+        what insert() did to them. """
         if puzzle is None:
             puzzle = self.puzzle
 
         if not isinstance(puzzle[index], int):
             # cell is not solved; nothing to remove
             return
+        value = str(puzzle[index])
 
         # step one: load all candidates into cell
         puzzle[index] = self.candidates
@@ -317,6 +484,37 @@ class Sudoku:
                 self.used_in_box(row, col, candidate, puzzle)):
                 puzzle[index] = puzzle[index].replace(candidate, '')
 
+        # step three: restore value to neighbors where it is no longer used
+        box_r = row - (row % self.box_size)
+        box_c = col - (col % self.box_size)
+        neighbors = set(range(row * self.size, (row + 1) * self.size))
+        neighbors.update(range(col, self.size**2, self.size))
+        for i in range(box_r, box_r + self.box_size):
+            neighbors.update(range(i * self.size + box_c,
+                                   i * self.size + box_c + self.box_size))
+        for j in neighbors:
+            if isinstance(puzzle[j], int) or value in puzzle[j]:
+                continue
+            r = j // self.size
+            c = j % self.size
+            if not (self.used_in_row(r, value, puzzle) or
+                    self.used_in_col(c, value, puzzle) or
+                    self.used_in_box(r, c, value, puzzle)):
+                # keep candidate string in canonical order
+                puzzle[j] = ''.join(candidate for candidate in self.candidates
+                                    if candidate in puzzle[j]
+                                    or candidate == value)
+
+
+    def restore(self, snapshot):
+        """ resets self.puzzle to the values in given snapshot (a Grid, or any
+        sequence of ints with 0 for empty cells), recomputing the candidates
+        of every empty cell. Inverse of snapshot(). """
+        self.puzzle = [self.candidates] * self.size**2
+        for i in range(len(snapshot)):
+            if snapshot[i] != 0:
+                self.insert(str(snapshot[i]), i)
+
 
     def score(self, puzzle=None):
         if puzzle is None:
@@ -349,19 +547,103 @@ class Sudoku:
         return self.difficulty
 
 
-    def solve(self, puzzle=None, report=True):
+    def snapshot(self, puzzle=None):
+        """ returns a compact Grid of the solved cells of given puzzle, for
+        keeping large histories of puzzles without their candidate lists. """
+        if puzzle is None:
+            puzzle = self.puzzle
+
+        return Grid(self.size, self.encode(puzzle))
+
+
+    def search(self, puzzle, factors=None, interval=None):
+        """ search engine behind solve_all() and iter_solutions(). generator
+        that walks the search tree of given puzzle depth first with an
+        explicit stack (no recursion), yielding each complete puzzle it
+        reaches, and None every interval search nodes if interval is given.
+
+        Each stack frame is (puzzle, Buckets, iterator over the search set
+        built by expand(), branching factor). When a frame's branches are all
+        exhausted, its branching factor is appended to factors, if given.
+        Every node is counted in self.nodes, and charged to the budget with
+        check_budget() if one is set.
+        """
+        stack = []
+        node = puzzle
+        buckets = Buckets(puzzle, len(self.candidates))
+        budgeted = (self.max_nodes is not None or self.deadline is not None
+                    or self.cancel is not None)
+
+        while True:
+            if budgeted:
+                self.check_budget()
+            else:
+                self.nodes += 1
+            if interval and self.nodes % interval == 0:
+                yield None
+
+            search_set = self.expand(node, buckets)
+            if search_set is None:
+                # dead end; fall through to next branch
+                pass
+            elif not search_set:
+                # puzzle is complete
+                yield node
+            else:
+                stack.append((node, buckets, iter(search_set),
+                              len(search_set)))
+
+            # descend into the next untried branch of the deepest frame
+            while stack:
+                frame = stack[-1]
+                branch = next(frame[2], None)
+                if branch is not None:
+                    node = frame[0][:]
+                    buckets = frame[1].copy()
+                    self.insert(branch[0], branch[1], node, buckets)
+                    break
+
+                # search tree is exhausted from this node
+                stack.pop()
+                if factors is not None:
+                    factors.append(frame[3])
+            else:
+                return
+
+
+    def set_budget(self, max_nodes=None, timeout=None, cancel=None):
+        """ helper function for solve() and iter_solutions(). starts a new
+        search budget of max_nodes search nodes and timeout seconds, either
+        of which may be None for no limit, and an optional cancel token;
+        see check_budget() """
+        self.nodes = 0
+        self.max_nodes = max_nodes
+        if timeout is None:
+            self.deadline = None
+        else:
+            self.deadline = time.monotonic() + timeout
+        self.cancel = cancel
+
+
+    def solve(self, puzzle=None, report=True, max_nodes=None, timeout=None,
+              cancel=None):
         """ calls solve_all() to generate solution(s), scores unique solution
-        if found, and (optionally) prints the resultant solution """
+        if found, and (optionally) prints the resultant solution.
 
-        # first, clear values in solutions list
-        self.solutions = []
-        self.branch_factors = []
+        The search can be bounded by max_nodes search nodes, timeout seconds
+        and a cancel token (any object with an is_set() method, such as a
+        threading.Event). If the budget runs out before a verdict is reached,
+        self.status is 'budget exceeded' and the difficulty is NaN, as for an
+        invalid puzzle; check self.status to tell the two apart. """
 
-        self.solve_all(puzzle)
-        self.score(puzzle)
+        for nodes in self.solve_steps(puzzle, None, max_nodes, timeout,
+                                      cancel):
+            pass
 
         if report:
-            if len(self.solutions) == 0:
+            if self.status == 'budget exceeded':
+                print("Solve budget exceeded before a verdict was reached.")
+            elif len(self.solutions) == 0:
                 print("No solution could be found.")
             elif len(self.solutions) == 1:
                 print("Unique solution: ")
@@ -374,75 +656,99 @@ class Sudoku:
     def solve_all(self, puzzle=None):
         """ solver function that utilizes backtracking, randomization, and
         optimization. Returns solved puzzle, or None if given puzzle is
-        unsolvable. Stores found solutions in self.solutions list.
+        unsolvable. Stores found solutions in self.solutions list, stopping
+        as soon as a second one is found, and the branching factor of every
+        exhausted search node in self.branch_factors.
 
         The optimization is that this solver does not traverse all cells in
         order (from 0 to 80 in a 9x9 puzzle, for example). Instead, it picks
         the cell with the fewest remaining candidates, or the set and value
-        with the fewest possible positions, whichever is smaller.
+        with the fewest possible positions, whichever is smaller; see
+        expand() and search().
         """
+        for nodes in self.solve_all_steps(puzzle):
+            pass
+
+        if len(self.solutions) == 0:
+            return None
+        return self.solutions[-1]
+
+
+    def solve_all_steps(self, puzzle=None, interval=None):
+        """ generator form of solve_all() that yields the number of search
+        nodes visited so far every interval nodes (never, if interval is
+        None), so that the solve can be paused and resumed. """
         if puzzle is None:
             puzzle = self.puzzle[:]
-            
-        while not self.is_complete(puzzle):
-            i = self.fewest_candidates(puzzle)
-            # fewest_candidates() skips solved cells                
- 
-            if len(puzzle[i]) == 1:
-                # all candidates but one have been eliminated; officially
-                # solve cell with insert()
-                self.insert(puzzle[i], i, puzzle)
+
+        for solution in self.search(puzzle, self.branch_factors, interval):
+            if solution is None:
+                # pause requested by search()
+                yield self.nodes
                 continue
-            if len(puzzle[i]) == 0:
-                # cell has no possible solutions; puzzle unsolvable
-                return None
-            if len(puzzle[i]) > 1:
-                # cell has more than one candidate
-
-                search_set = []
-                """ find value with fewest possible remaining positions in
-                some set (row, column, or box) """
-                fpp_value, fpp_positions = (
-                    self.fewest_positions(puzzle))
-                
-                if len(fpp_positions) < len(puzzle[i]):
-                    # value-set is more promising than current cell
-                    for position in fpp_positions:
-                        # build search_set to try value in each position in set
-                        search_set.append((fpp_value, position))
-                else:
-                    # current cell is more promising than value-set
-                    candidates = random.sample(puzzle[i], len(puzzle[i]))
-                    for candidate in candidates:
-                        # build search-set to try each candidate in cell
-                        search_set.append((candidate, i))
-
-                branches = 0
-
-                for candidate, position in search_set:
-                    puzzle_copy = puzzle[:]
-
-                    self.insert(candidate, position, puzzle_copy)
-
-                    # recurse on copy and mark branching
-                    branches += 1
-                    puzzle_copy = self.solve_all(puzzle_copy)
-
-                    # check that we haven't found more than one solution
-                    if (len(self.solutions) >= 2
-                        and puzzle_copy is not None):
-                        # we have, so start kick
-                        return puzzle_copy
-                        
-                # search tree is exhausted from this node
-                self.branch_factors.append(branches)
-                return None
-            
-        # puzzle is complete; store it in solutions and score
-        if puzzle not in self.solutions:
-            self.solutions.append(puzzle)
-            
-        return puzzle
+
+            # puzzle is complete; store it in solutions
+            if solution not in self.solutions:
+                self.solutions.append(solution)
+            if len(self.solutions) >= 2:
+                # more than one solution; no need to search further
+                return
+
+
+    def solve_steps(self, puzzle=None, interval=100, max_nodes=None,
+                    timeout=None, cancel=None):
+        """ resumable form of solve(report=False): a generator that yields
+        the number of search nodes visited so far every interval nodes.
+        Once it is exhausted, self.solutions, self.difficulty and
+        self.status are set exactly as solve() sets them.
+
+        This lets a scheduler time-slice many solves in one process, e.g.
+        by calling next() on the solve_steps() of each of several Sudokus in
+        turn. Interleaving two solves of the same Sudoku is not supported,
+        as they share self.solutions and the budget. """
+
+        # first, clear values in solutions list
+        self.solutions = []
+        self.branch_factors = []
+        self.set_budget(max_nodes, timeout, cancel)
+
+        try:
+            yield from self.solve_all_steps(puzzle, interval)
+        except BudgetExceeded:
+            self.status = 'budget exceeded'
+            self.difficulty = np.NaN
+        else:
+            self.score(puzzle)
+            if len(self.solutions) == 0:
+                self.status = 'unsolvable'
+            elif len(self.solutions) == 1:
+                self.status = 'unique'
+            else:
+                self.status = 'multiple'
+        finally:
+            self.clear_budget()
+
+
+    def units(self):
+        """ helper function for fewest_positions(). returns the cell indices
+        of every column, then every row, then every box of a puzzle of this
+        size, each in row-major order; cached per size in unit_cache. """
+        if self.size not in self.unit_cache:
+            size = self.size
+            box_size = self.box_size
+            units = []
+            for col in range(size):
+                units.append(list(range(col, size**2, size)))
+            for row in range(size):
+                units.append(list(range(row * size, (row + 1) * size)))
+            for box in range(size):
+                top_left = ((box // box_size) * box_size * size
+                            + (box % box_size) * box_size)
+                units.append([top_left + r * size + c
+                              for r in range(box_size)
+                              for c in range(box_size)])
+            self.unit_cache[size] = units
+        return self.unit_cache[self.size]
 
 
     def used_in_box(self, row, col, candidate, puzzle=None):
@@ -2,7 +2,8 @@
 
 from Sudoku import Sudoku
 from Timer import Timer, TimerError
-import Timer, random, math, time, numpy as np
+from GridFactory import GridFactory
+import Timer, random, math, time, heapq, numpy as np
 
 """ TODOs:
     - pickle puzzles
@@ -47,97 +48,95 @@ class SudokuGenerator:
 
     def __init__(self, label=''):
         self.label = str(label)
+        # GridFactory objects for each puzzle size requested so far
+        self.factories = {}
 
     def __str__(self):
         return 'SudokuGenerator ' + self.label
 
-    def create(self, size=9, label=time.time(), clues=[]):
+    def band(self, score):
+        """ returns the name of the difficulty tier that given score falls in,
+        or None if score is NaN. Scores past the last tier count as the last
+        tier. """
+        if math.isnan(score):
+            return None
+        for name, scores in self.difficulties.items():
+            if int(score) in scores:
+                return name
+        return name
+
+
+    def create(self, size=9, label=time.time(), clues=[], max_nodes=None,
+               timeout=None, cancel=None):
         """ return Sudoku of given size, with given clues and label. If no
-        clues are given, returns a Sudoku from scratch with randomization. """
+        clues are given, returns a Sudoku from scratch with randomization.
+
+        Given clues may be untrusted; the solve that scores them is bounded
+        by max_nodes, timeout and cancel, as in Sudoku.solve(). """
 
         if clues != []:
             # clues given; generate Sudoku with those
-            return Sudoku(size, label, clues)
-
-        """ otherwise, generate Sudoku from scratch. Initialize Sudoku object
-        with no clues in it, and all cells populated with candidates """
-        result = Sudoku(size, label)
-
-        # step one: fill box 1
-        # traverse by row and col the cells within the first box
-        top_left_index = 0
-        row_index_delta = result.size
-        row_beyond_box_index = result.size * result.box_size
-        for i in range(top_left_index, row_beyond_box_index, row_index_delta):
-            # create random sequence of candidates for row
-            values = random.sample(
-                list(result.puzzle[i]), len(result.puzzle[i]))
-            for j in range(i, i + result.box_size):
-                # pull random value and assign to cell
-                candidate = values.pop()
-                result.insert(candidate, j)
-
-        # step two: fill box 2
-        # traverse by row and col the cells within the second box
-        top_left_index += result.box_size
-        row_beyond_box_index += result.box_size
-        for i in range(top_left_index, row_beyond_box_index, row_index_delta):
-            # create random sequence of candidates for row
-            values = random.sample(
-                list(result.puzzle[i]), len(result.puzzle[i]))
-            for j in range(i, i + result.box_size):
-                row = j // result.size
-                if row < result.box_size - 1:
-                    """ we're not on last row, so only pick a value for the
-                    cell that won't make last row unsolvable. """
-                    brc = result.size * (result.box_size - 1) + result.box_size
-                    
-                    for v in values:
-                        """ temporarily remove v from candidates for cell in
-                        bottom-right corner of the current/second box """
-                        brc_wo_v = result.puzzle[brc].replace(v, '')
-                        if len(brc_wo_v) >= result.box_size:
-                            # bottom row of box will still be solvable
-                            candidate = v
-                            values.remove(v)
-                            break
-                else:
-                    # in last row of box; simply pick value and fill
-                    candidate = values.pop()
-
-                result.insert(candidate, j)
-
-        # step three: fill box 3
-        # traverse by row and col the cells within third box
-        top_left_index += result.box_size
-        row_beyond_box_index += result.box_size
-        for i in range(top_left_index, row_beyond_box_index, row_index_delta):
-            # create random sequence of candidates for row
-            values = random.sample(
-                list(result.puzzle[i]), len(result.puzzle[i]))
-            for j in range(i, i + result.box_size):
-                candidate = values.pop()
-                result.insert(candidate, j)
-
-        # step four: fill column 1
-        # traverse first col of entire puzzle, starting below first box
-        top_left_index = result.size * result.box_size
-        row_beyond_puzzle_index = result.size**2
-        for i in range(top_left_index, row_beyond_puzzle_index,
-                       row_index_delta):
-            values = random.sample(
-                list(result.puzzle[i]), len(result.puzzle[i]))
-            candidate = values.pop()
-            result.insert(candidate, i)
-
-        # step five: generate puzzle
+            return Sudoku(size, label, clues, max_nodes, timeout, cancel)
+
+        """ otherwise, generate Sudoku from scratch. Draw a complete, random
+        solution grid from the GridFactory for this size; no solve needed """
+        result = Sudoku(size, label, next(self.grids(size)))
+
+        # generate puzzle
         result = self.generate(result)
 
         return result
 
 
-    def generate(self, given_puzzle, steps=20, walks=20, report=True):
+    def estimator_accuracy(self, puzzles):
+        """ reports how well Sudoku.estimate() predicts the tier of score(),
+        over the given Sudokus that have a unique solution. Returns a dict
+        with the number of puzzles compared, the fractions whose estimated
+        tier is exact and within one tier, and the mean absolute error of
+        the estimated score. """
+        tiers = list(self.difficulties)
+        compared = 0
+        exact = 0
+        within_one = 0
+        error = 0
+
+        for puzzle in puzzles:
+            if len(puzzle.solutions) != 1:
+                continue
+            estimate = puzzle.estimate()
+            compared += 1
+            error += abs(estimate - puzzle.difficulty)
+            distance = abs(tiers.index(self.band(estimate))
+                           - tiers.index(self.band(puzzle.difficulty)))
+            if distance == 0:
+                exact += 1
+            if distance <= 1:
+                within_one += 1
+
+        if compared == 0:
+            return {'puzzles': 0, 'exact': np.NaN, 'within one': np.NaN,
+                    'mean error': np.NaN}
+
+        return {'puzzles': compared, 'exact': exact / compared,
+                'within one': within_one / compared,
+                'mean error': error / compared}
+
+
+    def generate(self, given_puzzle, steps=20, walks=20, report=True,
+                 prefilter=False, telemetry=None):
         """ with optimization (i.e., minimizes Sudoku creation)
+
+        If prefilter is True, each step is first scored with the cheap
+        Sudoku.estimate(), and the full solve() is skipped when the estimate
+        settles the step: an exact estimate (below 100) is recorded as the
+        puzzle's score, and a NaN estimate (the puzzle is most likely not
+        uniquely solvable) tosses the step. Inexact estimates are too rough
+        to tell tiers apart (see benchmarks/calibrate_estimate.py), so those
+        puzzles are always solved.
+
+        If a Telemetry object is given, a 'walk' event is emitted after each
+        walk and a 'run' event at the end, with counts and solve times; see
+        Telemetry. Nothing is printed unless report is True.
         """
         total_timer = Timer.Timer(name="generate()")
         copy_timer = Timer.Timer(name="copying lists")
@@ -149,14 +148,21 @@ class SudokuGenerator:
             print("initial puzzle for generate():")
             print(given_puzzle)
             
-        given_puzzle.solve(report=False)
+        if given_puzzle.is_complete():
+            # given puzzle is already a solution grid, e.g. from grids()
+            solution = given_puzzle.puzzle
+        else:
+            given_puzzle.solve(report=False)
+            solution = given_puzzle.solutions[0]
         copy_timer.start()
-        working_grid = given_puzzle.solutions[0][:]
+        working_grid = solution[:]
         copy_timer.stop()
         obj_timer.start()
-        puzzle = Sudoku(puzzle=working_grid)
+        puzzle = Sudoku(given_puzzle.size, puzzle=working_grid)
         obj_timer.stop()
-        puzzles_found = [(0, given_puzzle.solutions[0])]
+        puzzles_found = [(0, puzzle.snapshot(solution))]
+        total_solves = 0
+        total_solve_time = 0
 
         for i in range(walks):
             # take given number of walks
@@ -172,6 +178,9 @@ class SudokuGenerator:
             additions = 0
             removals = 0
             tosses = 0
+            skips = 0
+            solves = 0
+            solve_time = 0
             
             for j in range(steps):
                 """ take given number of steps per walk. A 'step' is adding or
@@ -179,8 +188,7 @@ class SudokuGenerator:
                 randomly but proportional to the options there are. e.g., if
                 the puzzle is entirely complete, it will choose to remove with
                 certainty; if it is almost complete, it will choose to remove
-                with near-certainty, etc. """
-                p = 1 - len(unsolved_cells)/self.length(puzzle)
+                with near-certainty, etc.; see perturb(). """
 
                 """ copy previous Sudoku for alterations at this step; keep a
                 pointer to previous Sudoku and cell lists in case we alter to
@@ -191,36 +199,37 @@ class SudokuGenerator:
                 prev_solved_cells = solved_cells[:]
                 copy_timer.stop()
                 
-                if np.random.random() < p:
-                    # this step is a removal of clues
-                    # pick two cells from solved calls
+                if self.perturb(puzzle, solved_cells, unsolved_cells):
                     removals += 1
-                    positions = (
-                        np.random.choice(solved_cells, 2, replace=False))
-                    for index in positions:
-                        puzzle.remove(index)
-                        unsolved_cells.append(index)
-                        solved_cells.remove(index)
                 else:
-                    # this step is an addition of clues
-                    # pick two cells from unsolved cells
                     additions += 1
-                    positions = (
-                        np.random.choice(unsolved_cells, 2, replace=False))
-                    for index in positions:
-                        if len(list(puzzle[index])) == 0:
-                            # position has no candidates left; skip adding
-                            break
-                        value = np.random.choice(list(puzzle[index]))
-                        puzzle.insert(value, index)
-                        solved_cells.append(index)
-                        unsolved_cells.remove(index)
 
+                if prefilter:
+                    estimate = puzzle.estimate()
+                    if estimate < 100:
+                        # estimate is exact; puzzle is valid, skip solve
+                        skips += 1
+                        puzzles_found.append((estimate, puzzle.snapshot()))
+                        continue
+                    if math.isnan(estimate):
+                        # estimate rules puzzle out; skip solve and retreat
+                        skips += 1
+                        puzzle.puzzle = prev_grid
+                        unsolved_cells = prev_unsolved_cells
+                        solved_cells = prev_solved_cells
+                        continue
+
+                if telemetry is not None:
+                    start = time.perf_counter()
                 puzzle.solve(report=False)
+                solves += 1
+                if telemetry is not None:
+                    solve_time += time.perf_counter() - start
+
                 if puzzle.difficulty is not np.NaN:
-                    # new puzzle is valid; store it
+                    # new puzzle is valid; store a compact snapshot of it
                     copy_timer.start()
-                    result = puzzle.puzzle[:]
+                    result = puzzle.snapshot()
                     copy_timer.stop()
                     puzzles_found.append((puzzle.difficulty, result))
                 else:
@@ -232,37 +241,55 @@ class SudokuGenerator:
 
             if report:
                 print(f"walk {i} complete: {additions} additions, "
-                      f"{removals} removals, {tosses} tosses")
+                      f"{removals} removals, {tosses} tosses, "
+                      f"{skips} skips")
 
                 print("difficulties:\t", end=' ')
                 for score, candidate in puzzles_found:
                     print(score, end=' ')
                 print()
 
+            if telemetry is not None:
+                telemetry.emit('walk', method='generate', walk=i,
+                               additions=additions, removals=removals,
+                               tosses=tosses, skips=skips,
+                               toss_rate=tosses / steps,
+                               difficulties=[score for score, candidate
+                                             in puzzles_found],
+                               solves=solves, solve_time=solve_time)
+            total_solves += solves
+            total_solve_time += solve_time
+
 ##                print("puzzles_found:")
 ##                print(puzzles_found)
 
             puzzles_found.sort(key=lambda r:r[0], reverse=True)
             copy_timer.start()
-            puzzle.puzzle = puzzles_found[0][1][:]
+            puzzle.restore(puzzles_found[0][1])
             copy_timer.stop()
             puzzles_found = [puzzles_found[0]]
 
 ##            if report:
 ##                print(puzzles_found)
 
-        total_timer.stop()
-        print(total_timer)
-        print(copy_timer)
-        print(obj_timer)
-
-        puzzle.puzzle = puzzles_found[0][1]
+        elapsed = total_timer.stop()
+        if report:
+            print(total_timer)
+            print(copy_timer)
+            print(obj_timer)
+        if telemetry is not None:
+            telemetry.emit('run', method='generate', walks=walks, steps=steps,
+                           solves=total_solves, solve_time=total_solve_time,
+                           difficulty=puzzles_found[0][0], elapsed=elapsed)
+
+        puzzle.restore(puzzles_found[0][1])
         puzzle.solve(report=False)
 
         return puzzle
 
 
-    def generate_slow(self, given_puzzle, steps=20, walks=200, report=False):
+    def generate_slow(self, given_puzzle, steps=20, walks=200, report=False,
+                      telemetry=None):
         """ generate() without optimization (i.e., makes a ton of Sudokus)
         """
         total_timer = Timer.Timer(name="generate()")
@@ -275,6 +302,9 @@ class SudokuGenerator:
             print("initial puzzle for generate():")
             print(given_puzzle)
             
+        total_solve_time = 0
+        if telemetry is not None:
+            start = time.perf_counter()
         given_puzzle.solve(report=False)
         copy_timer.start()
         temp = given_puzzle.solutions[0][:]
@@ -282,7 +312,11 @@ class SudokuGenerator:
         obj_timer.start()
         puzzle = Sudoku(puzzle=temp)
         obj_timer.stop()
-        puzzles_found = [(0, puzzle)]
+        if telemetry is not None:
+            total_solve_time += time.perf_counter() - start
+        puzzles_found = [(0, puzzle.snapshot())]
+        # the solve of given_puzzle, and the one in Sudoku()
+        total_solves = 2
 
         for i in range(walks):
             # take given number of walks
@@ -298,6 +332,8 @@ class SudokuGenerator:
             additions = 0
             removals = 0
             tosses = 0
+            solves = 0
+            solve_time = 0
             
             for j in range(steps):
                 """ take given number of steps per walk. A 'step' is adding or
@@ -305,8 +341,7 @@ class SudokuGenerator:
                 randomly but proportional to the options there are. e.g., if
                 the puzzle is entirely complete, it will choose to remove with
                 certainty; if it is almost complete, it will choose to remove
-                with near-certainty, etc. """
-                p = 1 - len(unsolved_cells)/self.length(puzzle)
+                with near-certainty, etc.; see perturb(). """
 
                 """ copy previous Sudoku for alterations at this step; keep a
                 pointer to previous Sudoku and cell lists in case we alter to
@@ -317,39 +352,31 @@ class SudokuGenerator:
                 prev_solved_cells = solved_cells[:]
                 temp = puzzle[:]
                 copy_timer.stop()
+                if telemetry is not None:
+                    start = time.perf_counter()
                 obj_timer.start()
                 puzzle = Sudoku(puzzle=temp)
                 obj_timer.stop()
+                solves += 1
+                if telemetry is not None:
+                    solve_time += time.perf_counter() - start
                 
-                if np.random.random() < p:
-                    # this step is a removal of clues
-                    # pick two cells from solved calls
+                if self.perturb(puzzle, solved_cells, unsolved_cells):
                     removals += 1
-                    positions = (
-                        np.random.choice(solved_cells, 2, replace=False))
-                    for index in positions:
-                        puzzle.remove(index)
-                        unsolved_cells.append(index)
-                        solved_cells.remove(index)
                 else:
-                    # this step is an addition of clues
-                    # pick two cells from unsolved cells
                     additions += 1
-                    positions = (
-                        np.random.choice(unsolved_cells, 2, replace=False))
-                    for index in positions:
-                        if len(list(puzzle[index])) == 0:
-                            # position has no candidates left; skip adding
-                            break
-                        value = np.random.choice(list(puzzle[index]))
-                        puzzle.insert(value, index)
-                        solved_cells.append(index)
-                        unsolved_cells.remove(index)
 
+                if telemetry is not None:
+                    start = time.perf_counter()
                 puzzle.solve(report=False)
+                solves += 1
+                if telemetry is not None:
+                    solve_time += time.perf_counter() - start
+
                 if puzzle.difficulty is not np.NaN:
-                    # new puzzle is valid; store it
-                    puzzles_found.append((puzzle.difficulty, puzzle))
+                    # new puzzle is valid; store a compact snapshot of it
+                    puzzles_found.append((puzzle.difficulty,
+                                          puzzle.snapshot()))
                 else:
                     # new puzzle is not valid; retreat to previous setup
                     tosses += 1
@@ -366,32 +393,67 @@ class SudokuGenerator:
                     print(score, end=' ')
                 print()
 
-            puzzles_found.sort(reverse=True)
-            puzzle = puzzles_found[0][1]
+            if telemetry is not None:
+                # two solves per step: the one in Sudoku() and solve()
+                telemetry.emit('walk', method='generate_slow', walk=i,
+                               additions=additions, removals=removals,
+                               tosses=tosses, toss_rate=tosses / steps,
+                               difficulties=[score for score, candidate
+                                             in puzzles_found],
+                               solves=solves, solve_time=solve_time)
+            total_solves += solves
+            total_solve_time += solve_time
+
+            puzzles_found.sort(key=lambda r:r[0], reverse=True)
+            if telemetry is not None:
+                start = time.perf_counter()
+            obj_timer.start()
+            puzzle = Sudoku(puzzle=puzzles_found[0][1])
+            obj_timer.stop()
+            total_solves += 1
+            if telemetry is not None:
+                total_solve_time += time.perf_counter() - start
             puzzles_found = [puzzles_found[0]]
 
             if report:
                 print(puzzles_found)
 
-        total_timer.stop()
-        print(total_timer)
-        print(copy_timer)
-        print(obj_timer)
+        elapsed = total_timer.stop()
+        if report:
+            print(total_timer)
+            print(copy_timer)
+            print(obj_timer)
+        if telemetry is not None:
+            telemetry.emit('run', method='generate_slow', walks=walks,
+                           steps=steps, solves=total_solves,
+                           solve_time=total_solve_time,
+                           difficulty=puzzles_found[0][0], elapsed=elapsed)
 
-        return puzzles_found[0][1]
+        return puzzle
     
 
-    def is_valid(self, puzzle):
+    def grids(self, size=9):
+        """ returns the GridFactory for given size, an iterator over random,
+        complete solution grids. Used by create() to seed generate(). """
+        if size not in self.factories:
+            self.factories[size] = GridFactory(size)
+        return self.factories[size]
+
+
+    def is_valid(self, puzzle, max_nodes=None, timeout=None, cancel=None):
         """ returns True if given Sudoku object has a single solution, False
-        otherwise. Runs solve() first to ensure Sudoku has a verdict.
+        otherwise. Runs solve() first to ensure Sudoku has a verdict, within
+        the given budget; a puzzle whose solve runs out of budget is not
+        valid, and has status 'budget exceeded'.
 
         precondition: given puzzle is Sudoku object.
         postcondition: given Sudoku has all solutions stored and, if valid,
         a difficulty score as well (NaN otherwise). """
 
         try:
-            puzzle.solve(report=False)
-            return len(puzzle.solutions) == 1
+            puzzle.solve(report=False, max_nodes=max_nodes, timeout=timeout,
+                         cancel=cancel)
+            return puzzle.status == 'unique'
         except AttributeError:
             print("AttributeError: is_valid() requires "
                   "a Sudoku object argument")
@@ -402,7 +464,221 @@ class SudokuGenerator:
         return len(sudoku.puzzle)
 
 
-gen = SudokuGenerator()
-puzzle = gen.create()
-print(puzzle)
-print("difficulty score: ", puzzle.difficulty)
+    def perturb(self, puzzle, solved_cells, unsolved_cells, bias=1):
+        """ helper function for generate(), generate_slow() and search().
+        takes one step of a walk on given Sudoku, adding or removing two
+        clues, where removal is chosen with probability f**bias for f the
+        fraction of cells solved, and updates the given cell lists. A bias
+        below 1 favors removal. Returns True for a removal, False for an
+        addition. """
+        p = (1 - len(unsolved_cells)/self.length(puzzle)) ** bias
+        if len(unsolved_cells) < 2 or np.random.random() < p:
+            # removal of clues
+            positions = np.random.choice(solved_cells, 2, replace=False)
+            for index in positions:
+                puzzle.remove(index)
+                unsolved_cells.append(index)
+                solved_cells.remove(index)
+            return True
+
+        # addition of clues
+        positions = np.random.choice(unsolved_cells, 2, replace=False)
+        for index in positions:
+            if len(puzzle[index]) == 0:
+                # position has no candidates left; skip adding
+                break
+            value = np.random.choice(list(puzzle[index]))
+            puzzle.insert(value, index)
+            solved_cells.append(index)
+            unsolved_cells.remove(index)
+        return False
+
+
+    def search(self, given_puzzle, solves=400, population=8, spread=8,
+               temperature=10, cooling=0.99, patience=40, bias=0.5,
+               target=800, report=False, telemetry=None):
+        """ population-based alternative to generate(). Walks like generate()
+        does, but accepts a worse (still valid) puzzle with probability
+        exp(delta / T), where delta is the change in difficulty and the
+        temperature T is multiplied by cooling after every step. Steps favor
+        removing clues over adding them by bias; see perturb().
+
+        Every valid puzzle seen is offered to a bounded min-heap of the top
+        population puzzles; a puzzle within spread cells of a member is only
+        kept if it beats that member, so the population stays diverse. After
+        patience steps without a new best puzzle, the walk restarts from a
+        random member of the population.
+
+        Stops after solves calls to solve(), or as soon as a puzzle scores at
+        least target, and returns the best puzzle found as a Sudoku. If a
+        Telemetry object is given, a 'restart' event is emitted at each
+        restart and a 'run' event at the end. """
+        started = time.perf_counter()
+        solve_time = 0
+
+        if given_puzzle.is_complete():
+            solution = given_puzzle.puzzle
+        else:
+            given_puzzle.solve(report=False)
+            solution = given_puzzle.solutions[0]
+        puzzle = Sudoku(given_puzzle.size, puzzle=solution[:])
+
+        # population heap entries are (difficulty, counter, Grid) tuples; the
+        # counter breaks ties so that Grids are never compared
+        heap = [(0, 0, puzzle.snapshot())]
+        counter = 1
+        best = heap[0]
+
+        def admit(difficulty, snapshot):
+            """ offers given puzzle to the population heap """
+            for k, (score, _, member) in enumerate(heap):
+                distance = sum(a != b for a, b in zip(member, snapshot))
+                if distance < spread:
+                    # too close to an existing member; keep the better one
+                    if difficulty > score:
+                        heap[k] = (difficulty, counter, snapshot)
+                        heapq.heapify(heap)
+                    return
+            if len(heap) < population:
+                heapq.heappush(heap, (difficulty, counter, snapshot))
+            elif difficulty > heap[0][0]:
+                heapq.heapreplace(heap, (difficulty, counter, snapshot))
+
+        current = 0
+        stale = 0
+        calls = 0
+        tosses = 0
+        restarts = 0
+        solved_cells = list(range(self.length(puzzle)))
+        unsolved_cells = []
+
+        for n in range(solves):
+            prev_grid = puzzle.puzzle[:]
+            prev_solved_cells = solved_cells[:]
+            prev_unsolved_cells = unsolved_cells[:]
+
+            self.perturb(puzzle, solved_cells, unsolved_cells, bias)
+            if telemetry is not None:
+                start = time.perf_counter()
+            puzzle.solve(report=False)
+            calls += 1
+            if telemetry is not None:
+                solve_time += time.perf_counter() - start
+
+            if puzzle.difficulty is np.NaN:
+                # new puzzle is not valid; retreat to previous setup
+                tosses += 1
+                accept = False
+            else:
+                admit(puzzle.difficulty, puzzle.snapshot())
+                counter += 1
+                delta = puzzle.difficulty - current
+                accept = (delta >= 0 or
+                          random.random() < math.exp(delta / temperature))
+
+            if accept:
+                current = puzzle.difficulty
+            else:
+                puzzle.puzzle = prev_grid
+                solved_cells = prev_solved_cells
+                unsolved_cells = prev_unsolved_cells
+
+            temperature = max(temperature * cooling, 1e-3)
+
+            top = max(heap)
+            if top[0] > best[0]:
+                best = top
+                stale = 0
+            else:
+                stale += 1
+
+            if best[0] >= target:
+                break
+
+            if stale >= patience:
+                # restart walk from a random member of the population
+                restarts += 1
+                stale = 0
+                current, _, member = random.choice(heap)
+                if telemetry is not None:
+                    telemetry.emit('restart', method='search', solves=calls,
+                                   tosses=tosses, best=best[0],
+                                   difficulty=current)
+                puzzle.restore(member)
+                solved_cells = [k for k in range(len(member)) if member[k]]
+                unsolved_cells = [k for k in range(len(member))
+                                  if not member[k]]
+
+        if report:
+            print(f"search complete: {calls} solves, {tosses} tosses, "
+                  f"{restarts} restarts")
+            print("population:\t", *sorted(
+                (score for score, _, _ in heap), reverse=True))
+        if telemetry is not None:
+            telemetry.emit('run', method='search', solves=calls,
+                           solve_time=solve_time, tosses=tosses,
+                           toss_rate=tosses / calls if calls else 0,
+                           restarts=restarts,
+                           population=sorted(
+                               (score for score, _, _ in heap), reverse=True),
+                           difficulty=best[0],
+                           elapsed=time.perf_counter() - started)
+
+        puzzle.restore(best[2])
+        puzzle.solve(report=False)
+
+        return puzzle
+
+
+    def variants(self, puzzle, limit=None, patience=100):
+        """ generator that yields distinct puzzles isomorphic to given Sudoku,
+        which must be uniquely solvable (as after solve()), up to limit of
+        them (without end, if limit is None).
+
+        Each variant applies a random validity-preserving transform from
+        GridFactory.random_transform() (digit relabeling, row and column
+        permutations within bands and stacks, band and stack swaps and
+        transposition) to the given clues and to the solution alike. Such
+        transforms keep the puzzle uniquely solvable, so variants are built
+        with solve=False: the solution is transformed, and difficulty and
+        branch_factors are copied from given Sudoku rather than recomputed.
+
+        Variants are de-duplicated by the hash of their encoded clues; the
+        generator stops early if patience transforms in a row only give
+        duplicates, as happens for small puzzles with few variants. """
+        if len(puzzle.solutions) != 1:
+            raise ValueError("variants() requires a uniquely solvable Sudoku")
+
+        factory = self.grids(puzzle.size)
+        clues = list(puzzle.encode())
+        solution = puzzle.solutions[0]
+
+        seen = {hash(puzzle.encode())}
+        duplicates = 0
+        while limit is None or len(seen) <= limit:
+            transform = factory.random_transform()
+            variant_clues = factory.apply(clues, transform)
+
+            key = hash(bytes(variant_clues))
+            if key in seen:
+                duplicates += 1
+                if duplicates >= patience:
+                    return
+                continue
+            seen.add(key)
+            duplicates = 0
+
+            variant = Sudoku(puzzle.size, f"{puzzle.label}-{len(seen) - 1}",
+                             variant_clues, solve=False)
+            variant.solutions = [factory.apply(solution, transform)]
+            variant.branch_factors = puzzle.branch_factors[:]
+            variant.difficulty = puzzle.difficulty
+            variant.status = 'unique'
+            yield variant
+
+
+if __name__ == '__main__':
+    gen = SudokuGenerator()
+    puzzle = gen.create()
+    print(puzzle)
+    print("difficulty score: ", puzzle.difficulty)
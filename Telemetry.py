@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+
+import json
+import time
+
+
+class Telemetry:
+    """ buffered stream of structured events from generator runs, delivered
+    as JSON lines appended to a file, to an in-process callback, or both.
+
+    emit() only appends the event to an in-memory buffer; events are
+    serialized and delivered by flush(), which runs when the buffer is full
+    and on close(). Generator methods take telemetry=None by default, in
+    which case they emit nothing and pay nothing. """
+
+    def __init__(self, path=None, callback=None, buffer=1000):
+        self.path = path
+        self.callback = callback
+        self.buffer = buffer
+        self.events = []
+        self.file = None
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+    def close(self):
+        """ flushes buffered events and closes the file, if any """
+        self.flush()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+    def emit(self, event, **fields):
+        """ records an event of given type, with given fields and the time it
+        was emitted """
+        fields['event'] = event
+        fields['time'] = time.time()
+        self.events.append(fields)
+        if len(self.events) >= self.buffer:
+            self.flush()
+
+
+    def flush(self):
+        """ delivers buffered events to the file and callback """
+        events = self.events
+        self.events = []
+        if not events:
+            return
+
+        if self.path is not None:
+            if self.file is None:
+                self.file = open(self.path, 'a')
+            self.file.writelines(json.dumps(e, default=str) + '\n'
+                                 for e in events)
+            self.file.flush()
+
+        if self.callback is not None:
+            for e in events:
+                self.callback(e)
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+
+""" calibrates Sudoku.estimate() against solve() and score(). Walks from
+fresh solution grids, half the seeds like search() does (favoring removal,
+with annealed acceptance) and half like generate() does, and for every step
+records the puzzle's Sudoku.features(), whether it has a unique solution,
+the B term of its score and the time its solve took, to
+estimate_calibration.csv next to this script (not kept in the repository).
+
+Then fits Sudoku.validity_fit, a logistic regression of uniqueness on the
+features, and Sudoku.estimate_fit, a least-squares fit of B on the features
+for uniquely solvable puzzles, on the even seeds, and reports on the odd
+seeds how much solve time estimate() would save by ruling puzzles out, what
+it would lose, and how often it gets the tier right.
+
+usage: python benchmarks/calibrate_estimate.py [seeds] [steps] """
+
+import os, sys, csv, math, time, random, numpy as np
+
+here = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(here))
+
+from Sudoku import Sudoku
+from SudokuGenerator import SudokuGenerator
+from GridFactory import GridFactory
+
+path = os.path.join(here, 'estimate_calibration.csv')
+columns = ['seed', 'intercept', 'empty', 'unsolved', 'two', 'three', 'more',
+           'unique', 'B', 'seconds']
+
+
+def collect(seeds=range(80), steps=400):
+    """ returns a list of rows with the columns above, for every step of a
+    walk from each seed whose puzzle naked singles do not solve or rule out
+    (estimate() is exact for those) """
+    gen = SudokuGenerator()
+    rows = []
+    for seed in seeds:
+        random.seed(seed)
+        np.random.seed(seed)
+        puzzle = Sudoku(9, puzzle=next(GridFactory(9)))
+        solved_cells = list(range(gen.length(puzzle)))
+        unsolved_cells = []
+        current = 0
+        # odd seeds walk like generate(), even seeds like search()
+        bias, temperature = (1, 1e6) if seed % 4 >= 2 else (0.5, 10)
+
+        for step in range(steps):
+            prev_grid = puzzle.puzzle[:]
+            prev_solved_cells = solved_cells[:]
+            prev_unsolved_cells = unsolved_cells[:]
+
+            gen.perturb(puzzle, solved_cells, unsolved_cells, bias)
+            features = puzzle.features()
+            start = time.perf_counter()
+            puzzle.solve(report=False)
+            seconds = time.perf_counter() - start
+
+            unique = puzzle.status == 'unique'
+            if features is not None and features[2] > 0:
+                B = (puzzle.difficulty - features[1]) // 100 if unique else -1
+                rows.append([seed] + features + [int(unique), B, seconds])
+
+            if unique:
+                delta = puzzle.difficulty - current
+                if delta >= 0 or random.random() < math.exp(delta /
+                                                            temperature):
+                    current = puzzle.difficulty
+                    continue
+
+            # retreat to previous setup
+            puzzle.puzzle = prev_grid
+            solved_cells = prev_solved_cells
+            unsolved_cells = prev_unsolved_cells
+    return rows
+
+
+def fit(rows):
+    """ returns (estimate_fit, validity_fit) fitted on given rows """
+    X = np.array([r[1:7] for r in rows], dtype=float)
+    unique = np.array([r[7] for r in rows], dtype=float)
+    B = np.array([r[8] for r in rows], dtype=float)
+
+    # logistic regression by Newton's method
+    w = np.zeros(X.shape[1])
+    for iteration in range(50):
+        p = 1 / (1 + np.exp(-X @ w))
+        H = X.T @ (X * (p * (1 - p))[:, None]) + 1e-6 * np.eye(len(w))
+        w += np.linalg.solve(H, X.T @ (unique - p))
+
+    valid = unique == 1
+    c = np.linalg.lstsq(X[valid], B[valid], rcond=None)[0]
+    return tuple(c.round(4)), tuple(w.round(4))
+
+
+def report(rows, estimate_fit, validity_fit, cutoff):
+    """ prints what estimate() with given fits does on given rows """
+    X = np.array([r[1:7] for r in rows], dtype=float)
+    unique = np.array([r[7] for r in rows]) == 1
+    B = np.array([r[8] for r in rows], dtype=float)
+    seconds = np.array([r[9] for r in rows])
+
+    out = 1 / (1 + np.exp(-X @ np.array(validity_fit))) < cutoff
+    print(f"ruled out at cutoff {cutoff}: {out.mean():.1%} of solves, "
+          f"{seconds[out].sum() / seconds.sum():.1%} of solve time")
+    print(f"unique puzzles ruled out: {(out & unique).sum()} of "
+          f"{unique.sum()}; with B >= 6: {(out & (B >= 6)).sum()} of "
+          f"{(B >= 6).sum()}")
+
+    estimate = np.maximum(1, X @ np.array(estimate_fit)) * 100 + X[:, 1]
+    score = B * 100 + X[:, 1]
+    tiers = list(SudokuGenerator.difficulties)
+    band = lambda s: np.minimum(s // 200, len(tiers) - 1)
+    distance = abs(band(estimate) - band(score))[unique]
+    print(f"tier of unique puzzles: exact {(distance == 0).mean():.1%}, "
+          f"within one {(distance <= 1).mean():.1%}")
+    print("tier\t\tcount\tmean score\tmean estimate")
+    for k, tier in enumerate(tiers):
+        chosen = unique & (band(score) == k)
+        if chosen.any():
+            print(f"{tier:<12}\t{chosen.sum()}\t{score[chosen].mean():.0f}"
+                  f"\t\t{estimate[chosen].mean():.0f}")
+
+
+if __name__ == '__main__':
+    seeds = int(sys.argv[1]) if len(sys.argv) > 1 else 80
+    steps = int(sys.argv[2]) if len(sys.argv) > 2 else 400
+
+    rows = collect(range(seeds), steps)
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        writer.writerows(rows)
+
+    estimate_fit, validity_fit = fit([r for r in rows if r[0] % 2 == 0])
+    print(f"{len(rows)} puzzles written to {path}")
+    print(f"estimate_fit = {estimate_fit}")
+    print(f"validity_fit = {validity_fit}")
+    report([r for r in rows if r[0] % 2 == 1], estimate_fit, validity_fit,
+           Sudoku.validity_cutoff)
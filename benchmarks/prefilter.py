@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+
+""" times SudokuGenerator.generate() with and without its estimate()
+prefilter. Each seed draws a fresh solution grid, then generate() is run from
+it under the same random seed both ways, and the total wall-clock time, the
+number of full solves, and the difficulties found are printed for each.
+
+usage: python benchmarks/prefilter.py [seeds] """
+
+import os, sys, time, random, numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Sudoku import Sudoku
+from SudokuGenerator import SudokuGenerator
+from GridFactory import GridFactory
+from Telemetry import Telemetry
+
+
+def run(seed, prefilter):
+    """ returns (seconds, solves, difficulty) for one generate() from the
+    solution grid for given seed """
+    random.seed(seed)
+    np.random.seed(seed)
+    grid = next(GridFactory(9))
+    random.seed(seed + 1000)
+    np.random.seed(seed + 1000)
+
+    events = []
+    start = time.perf_counter()
+    with Telemetry(callback=events.append) as telemetry:
+        result = SudokuGenerator().generate(Sudoku(9, puzzle=grid),
+                                            report=False, prefilter=prefilter,
+                                            telemetry=telemetry)
+    seconds = time.perf_counter() - start
+    solves = [e for e in events if e['event'] == 'run'][0]['solves']
+    return seconds, solves, result.difficulty
+
+
+if __name__ == '__main__':
+    seeds = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+
+    print("prefilter\tseconds\tsolves\tmean difficulty\thard or harder")
+    for prefilter in (False, True):
+        results = [run(seed, prefilter) for seed in range(seeds)]
+        hard = sum(r[2] >= SudokuGenerator.difficulties['hard'].start
+                   for r in results)
+        print(f"{prefilter}\t\t{sum(r[0] for r in results):.2f}\t"
+              f"{sum(r[1] for r in results)}\t"
+              f"{np.mean([r[2] for r in results]):.1f}\t\t{hard} of {seeds}")
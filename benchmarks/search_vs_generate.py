@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+
+""" compares SudokuGenerator.search() with generate() at the same budget of
+solve() calls. Each seed draws a fresh solution grid, then both methods are
+run from it under the same random seed, and the best difficulty each one
+finds is printed, with how often each reaches the 'hard' and 'very hard'
+tiers.
+
+usage: python benchmarks/search_vs_generate.py [seeds] [solves] """
+
+import os, sys, random, numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Sudoku import Sudoku
+from SudokuGenerator import SudokuGenerator
+from GridFactory import GridFactory
+
+
+def run(seed, method, solves=400):
+    """ returns the difficulty of the puzzle found by given method, 'search'
+    or 'generate', from the solution grid for given seed """
+    random.seed(seed)
+    np.random.seed(seed)
+    grid = next(GridFactory(9))
+    random.seed(seed + 1000)
+    np.random.seed(seed + 1000)
+
+    gen = SudokuGenerator()
+    if method == 'search':
+        result = gen.search(Sudoku(9, puzzle=grid), solves=solves,
+                            target=float('inf'))
+    else:
+        result = gen.generate(Sudoku(9, puzzle=grid), steps=20,
+                              walks=solves // 20, report=False)
+    return result.difficulty
+
+
+def compare(seeds=range(100), solves=400):
+    """ returns a list of (seed, generate difficulty, search difficulty) """
+    return [(seed, run(seed, 'generate', solves), run(seed, 'search', solves))
+            for seed in seeds]
+
+
+if __name__ == '__main__':
+    seeds = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    solves = int(sys.argv[2]) if len(sys.argv) > 2 else 400
+
+    results = compare(range(seeds), solves)
+    print("seed\tgenerate\tsearch")
+    for seed, generated, searched in results:
+        print(f"{seed}\t{generated}\t\t{searched}")
+    print(f"mean\t{np.mean([r[1] for r in results]):.1f}\t\t"
+          f"{np.mean([r[2] for r in results]):.1f}")
+    for tier in ('hard', 'very hard'):
+        start = SudokuGenerator.difficulties[tier].start
+        generated = sum(r[1] >= start for r in results)
+        searched = sum(r[2] >= start for r in results)
+        print(f"{tier} or harder: generate {generated}, search {searched} "
+              f"of {seeds}")
+    print(f"search ahead on {sum(r[2] > r[1] for r in results)}, behind on "
+          f"{sum(r[2] < r[1] for r in results)} of {seeds} seeds")
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+
+""" tests for SudokuGenerator.py """
+
+import os, json, random
+
+from Sudoku import Sudoku
+from SudokuGenerator import SudokuGenerator
+
+here = os.path.dirname(os.path.abspath(__file__))
+
+# uniquely solvable puzzles from the solver regression cases
+with open(os.path.join(here, 'solver_cases.json')) as f:
+    unique_cases = [case for case in json.load(f)
+                    if len(case['solutions']) == 1][:3]
+
+
+def test_variants_solve_to_transformed_solution():
+    random.seed(0)
+    gen = SudokuGenerator()
+
+    for case in unique_cases:
+        puzzle = Sudoku(puzzle=[int(c) for c in case['puzzle']])
+        variants = list(gen.variants(puzzle, limit=4))
+
+        assert len(variants) == 4
+        assert len({v.encode() for v in variants}) == 4
+        for variant in variants:
+            # variants are built without solving; solve one from its clues
+            solved = Sudoku(puzzle=list(variant.encode()))
+
+            assert solved.status == 'unique'
+            assert solved.solutions == variant.solutions
+            assert solved.solutions[0] != puzzle.solutions[0]
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+
+""" tests for the batch verifier in Grader.py """
+
+import random, numpy as np
+
+from Grader import Grader
+from GridFactory import GridFactory
+
+
+def grids(count, seed=0):
+    # count valid 9x9 solution grids, as an (count, 81) array
+    random.seed(seed)
+    np.random.seed(seed)
+    factory = GridFactory(9)
+    return np.array([next(factory) for i in range(count)])
+
+
+def relabel(grid):
+    # a different valid grid: the same grid with digits 1 and 2 swapped
+    return np.select([grid == 1, grid == 2], [2, 1], grid)
+
+
+def test_valid_batch():
+    batch = grids(5)
+    valid, conflicts = Grader().verify(batch)
+
+    assert valid.tolist() == [True] * 5
+    assert conflicts.shape == (5, 81)
+    assert not conflicts.any()
+
+
+def test_duplicate_flags_exactly_repeated_cells():
+    batch = grids(3)
+    grid = batch[1]
+    # copy cell 1's value into cell 0, its neighbor in row 0 and box 0; the
+    # value is then repeated in row 0, box 0 and column 0
+    value = grid[1]
+    in_column = next(i for i in range(0, 81, 9) if grid[i] == value)
+    grid[0] = value
+
+    valid, conflicts = Grader().verify(batch)
+
+    assert valid.tolist() == [True, False, True]
+    assert set(np.flatnonzero(conflicts[1])) == {0, 1, in_column}
+    assert not conflicts[[0, 2]].any()
+
+
+def test_out_of_range_cells():
+    batch = grids(3)
+    batch[0, 40] = 0
+    batch[2, 80] = 10
+
+    valid, conflicts = Grader().verify(batch)
+
+    assert valid.tolist() == [False, True, False]
+    assert np.flatnonzero(conflicts[0]).tolist() == [40]
+    assert np.flatnonzero(conflicts[2]).tolist() == [80]
+
+
+def test_mismatch_against_one_solution():
+    solution = grids(1)[0]
+    batch = np.array([solution, relabel(solution), solution])
+
+    valid, conflicts = Grader().verify(batch, solution)
+
+    assert valid.tolist() == [True, False, True]
+    assert (conflicts[1] == np.isin(solution, [1, 2])).all()
+
+
+def test_mismatch_against_solution_per_submission():
+    solutions = grids(3)
+    batch = solutions.copy()
+    batch[2] = relabel(batch[2])
+
+    valid, conflicts = Grader().verify(batch, solutions)
+
+    assert valid.tolist() == [True, True, False]
+    # every submission is a valid grid; only the mismatch is flagged
+    assert Grader().verify(batch)[0].all()
+    assert conflicts[2].sum() == 18
+
+
+def test_empty_batch():
+    valid, conflicts = Grader().verify(np.empty((0, 81), dtype=int))
+
+    assert valid.shape == (0,)
+    assert conflicts.shape == (0, 81)
+
+
+def test_chunks_match_single_pass():
+    batch = grids(7)
+    # errors in the first and last grid of chunks of 3
+    batch[2, 0] = batch[2, 1]
+    batch[3, 5] = 0
+    batch[6, 80] = 10
+    solutions = batch.copy()
+    solutions[5] = relabel(solutions[5])
+
+    for given in (None, solutions):
+        expected = Grader().verify(batch, given)
+        chunked = Grader(chunk=3).verify(batch, given)
+
+        assert (chunked[0] == expected[0]).all()
+        assert (chunked[1] == expected[1]).all()
+    assert Grader(chunk=3).verify(batch, solutions)[0].tolist() == [
+        True, True, False, False, True, False, False]
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+
+""" tests for GridFactory.py """
+
+import random, pytest
+
+from GridFactory import GridFactory
+
+
+def is_valid(grid, size):
+    """ True if every row, column and box of given grid holds 1 to size """
+    box_size = int(size ** 0.5)
+    values = set(range(1, size + 1))
+    for i in range(size):
+        if set(grid[i * size:(i + 1) * size]) != values:
+            return False
+        if set(grid[i::size]) != values:
+            return False
+    for top in range(0, size, box_size):
+        for left in range(0, size, box_size):
+            box = {grid[(top + r) * size + left + c]
+                   for r in range(box_size) for c in range(box_size)}
+            if box != values:
+                return False
+    return True
+
+
+def cycle_types(grid, size):
+    """ sorted cycle types of the permutations between pairs of rows in a
+    band and pairs of columns in a stack: unchanged by random_transform(),
+    so grids with different cycle types are not isomorphic """
+    box_size = int(size ** 0.5)
+    result = []
+    rows = [grid[i * size:(i + 1) * size] for i in range(size)]
+    cols = [grid[i::size] for i in range(size)]
+    for lines in (rows, cols):
+        for band in range(0, size, box_size):
+            for x in range(band, band + box_size):
+                for y in range(x + 1, band + box_size):
+                    where = {v: k for k, v in enumerate(lines[x])}
+                    seen = set()
+                    lengths = []
+                    for k in range(size):
+                        length = 0
+                        while k not in seen:
+                            seen.add(k)
+                            length += 1
+                            k = where[lines[y][k]]
+                        if length:
+                            lengths.append(length)
+                    result.append(tuple(sorted(lengths)))
+    return sorted(result)
+
+
+@pytest.mark.parametrize('size', [4, 9, 16, 25])
+def test_grids_are_valid(size):
+    random.seed(size)
+    factory = GridFactory(size, reseed=2)
+    for k in range(4):
+        assert is_valid(next(factory), size)
+
+
+@pytest.mark.parametrize('size', [9, 25])
+def test_mix_leaves_pattern_class(size):
+    random.seed(size)
+    factory = GridFactory(size)
+    pattern = factory.pattern()
+    seeds = [factory.mix(pattern, 10 * size**2) for k in range(3)]
+
+    for seed in seeds:
+        assert is_valid(seed, size)
+        assert cycle_types(seed, size) != cycle_types(pattern, size)
+        assert (cycle_types(factory.shuffle(seed), size)
+                == cycle_types(seed, size))
+    assert len({tuple(map(tuple, cycle_types(s, size))) for s in seeds}) == 3
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+
+""" tests for the interactive play session in HintSession.py """
+
+import random, pytest
+
+from Sudoku import Sudoku
+from HintSession import HintSession
+from GridFactory import GridFactory
+
+
+def rebuilt(sudoku, board):
+    # the board as Sudoku would build it from scratch from its values
+    fresh = Sudoku(sudoku.size, solve=False)
+    for i in range(len(board)):
+        if isinstance(board[i], int):
+            fresh.insert(str(board[i]), i)
+    return fresh.puzzle
+
+
+def session(values):
+    # a session on an unsolved 9x9 puzzle with given values, as a dict of
+    # cell index to value
+    puzzle = [0] * 81
+    for i, value in values.items():
+        puzzle[i] = value
+    return HintSession(Sudoku(puzzle=puzzle, solve=False))
+
+
+def test_random_edits_match_rebuilt_board():
+    random.seed(0)
+    grid = next(GridFactory(9))
+    puzzle = [value if random.random() < 0.3 else 0 for value in grid]
+    sudoku = Sudoku(puzzle=puzzle, solve=False)
+    play = HintSession(sudoku)
+    free = [i for i in range(81) if puzzle[i] == 0]
+
+    # the values the board should hold, with their own undo and redo history
+    values = puzzle[:]
+    undone = []
+    done = []
+
+    for step in range(3000):
+        move = random.choice(['place', 'place', 'erase', 'undo', 'redo'])
+        index = random.choice(free)
+        if move == 'place':
+            # any digit, including ones that clash with a neighbor
+            value = random.randint(1, 9)
+            play.place(index, value)
+            if values[index] != value:
+                done.append((index, values[index], value))
+                undone = []
+                values[index] = value
+        elif move == 'erase':
+            play.erase(index)
+            if values[index] != 0:
+                done.append((index, values[index], 0))
+                undone = []
+                values[index] = 0
+        elif move == 'undo':
+            assert play.undo() == bool(done)
+            if done:
+                index, before, after = done.pop()
+                values[index] = before
+                undone.append((index, before, after))
+        else:
+            assert play.redo() == bool(undone)
+            if undone:
+                index, before, after = undone.pop()
+                values[index] = after
+                done.append((index, before, after))
+
+        assert [play[i] if isinstance(play[i], int) else 0
+                for i in range(81)] == values
+        assert play.board == rebuilt(sudoku, play.board)
+
+
+def test_naked_single():
+    random.seed(0)
+    grid = next(GridFactory(9))
+    play = session({i: grid[i] for i in range(81) if i != 40})
+
+    assert play.hint() == ('naked single', 40, grid[40])
+
+
+def test_hidden_single():
+    # 1 is ruled out of row 0 everywhere but cell 0: by the 1s in rows 1
+    # and 2 for boxes 1 and 2, and in columns 1 and 2 for cells 1 and 2
+    play = session({12: 1, 24: 1, 28: 1, 56: 1})
+
+    assert play.hint() == ('hidden single', 0, 1)
+    assert len(play.candidates(0)) > 1
+
+
+def test_contradiction():
+    # cell 0 sees 1 to 8 in its row and 9 in its box
+    play = session({1: 1, 2: 2, 3: 3, 4: 4, 5: 5, 6: 6, 7: 7, 8: 8, 10: 9})
+
+    assert play.hint() == ('contradiction', 0, None)
+
+
+def test_contradiction_after_wrong_placement():
+    random.seed(1)
+    grid = next(GridFactory(9))
+    play = session({i: grid[i] for i in range(81) if i not in (0, 1)})
+    play.place(0, grid[1])
+
+    assert play.hint() == ('contradiction', 1, None)
+    assert play.undo()
+    assert play.hint()[0] == 'naked single'
+
+
+def test_givens_cannot_change():
+    play = session({0: 5})
+
+    with pytest.raises(ValueError):
+        play.place(0, 6)
+    with pytest.raises(ValueError):
+        play.erase(0)
+    assert play[0] == 5
+    assert play.undo_stack == []
+
+
+def test_value_out_of_range():
+    play = session({})
+
+    with pytest.raises(ValueError):
+        play.place(0, 10)
+    with pytest.raises(ValueError):
+        play.place(0, 0)
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+
+""" regression tests for the solver in Sudoku.py """
+
+import os, json, time, random, pytest
+
+from Sudoku import Sudoku
+from Buckets import Buckets
+from GridFactory import GridFactory
+
+here = os.path.dirname(os.path.abspath(__file__))
+
+""" 150 puzzles with the solutions, difficulty and branching factors that
+the recursive solve_all() gave them under the same random seed, before it
+was replaced by the explicit-stack search(). Even seeds are random removals
+from a grid, mostly with two solutions; odd seeds are minimal puzzles with a
+unique solution. """
+with open(os.path.join(here, 'solver_cases.json')) as f:
+    cases = json.load(f)
+
+
+def grid(text):
+    return [int(c) for c in text]
+
+
+@pytest.mark.parametrize('case', cases, ids=lambda case: str(case['seed']))
+def test_matches_recursive_solver(case):
+    random.seed(case['seed'])
+    sudoku = Sudoku(puzzle=grid(case['puzzle']))
+
+    assert sudoku.solutions == [grid(s) for s in case['solutions']]
+    assert sudoku.branch_factors == case['branch_factors']
+    if case['difficulty'] is None:
+        assert sudoku.difficulty != sudoku.difficulty
+    else:
+        assert sudoku.difficulty == case['difficulty']
+
+
+def test_builds_size_16():
+    # candidate strings of a 16x16 puzzle are longer than 16 characters,
+    # since values from 10 up take two
+    sudoku = Sudoku(16, max_nodes=500)
+
+    assert sudoku.status == 'budget exceeded'
+    assert sudoku.nodes == 501
+
+
+def test_buckets_follow_size_16_inserts():
+    # eliminating a two-digit value shortens a candidate string by two
+    random.seed(0)
+    sudoku = Sudoku(16, solve=False)
+    puzzle = sudoku.puzzle[:]
+    buckets = Buckets(puzzle, len(sudoku.candidates))
+    solution = next(GridFactory(16))
+
+    for index in random.sample(range(256), 120):
+        sudoku.insert(str(solution[index]), index, puzzle, buckets)
+        fresh = Buckets(puzzle, len(sudoku.candidates))
+
+        assert buckets.cells == fresh.cells
+        assert buckets.unsolved == fresh.unsolved
+
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_exact_estimate_matches_score(seed):
+    # below 100, estimate() claims to be the score itself; clear cells of a
+    # solution grid until it no longer is
+    random.seed(seed)
+    sudoku = Sudoku(puzzle=next(GridFactory(9)))
+    cells = random.sample(range(81), 81)
+
+    for removed, index in enumerate(cells):
+        sudoku.remove(index)
+        estimate = sudoku.estimate()
+        if not estimate < 100:
+            break
+        sudoku.solve(report=False)
+        assert estimate == sudoku.difficulty == removed + 1
+
+
+def test_budget_ends_with_solve():
+    # budgets given to the constructor or solve() do not outlive it
+    case = cases[1]
+    sudoku = Sudoku(puzzle=grid(case['puzzle']), timeout=0.05)
+    time.sleep(0.1)
+
+    assert sudoku.solve_all() == grid(case['solutions'][0])
+    assert Sudoku(puzzle=[0] * 81, max_nodes=5).solve_all() is not None
+
+
+def test_budget_ends_with_abandoned_iter_solutions():
+    sudoku = Sudoku(puzzle=[0] * 81, solve=False)
+    solutions = sudoku.iter_solutions(timeout=0.05)
+    next(solutions)
+    solutions.close()
+    time.sleep(0.1)
+
+    assert sudoku.solve_all() is not None
+
+    for solution in sudoku.iter_solutions(max_nodes=1000):
+        break
+    assert (sudoku.max_nodes, sudoku.deadline) == (None, None)